@@ -0,0 +1,170 @@
+# This file is part of Hypothesis, which may be found at
+# https://github.com/HypothesisWorks/hypothesis/
+#
+# Copyright the Hypothesis Authors.
+# Individual contributors are listed in AUTHORS.rst and the git log.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public License,
+# v. 2.0. If a copy of the MPL was not distributed with this file, You can
+# obtain one at https://mozilla.org/MPL/2.0/.
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+import hypothesistooling as tools
+from hypothesistooling.projects.hypothesispython import PYTHON_SRC
+from hypothesistooling.scripts import tool_path
+
+_PYRIGHT_GREEN_KEY = "hypothesis/pyright-green"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--pyright-cached",
+        action="store_true",
+        help="Reuse pyright results from previous runs when the source text, "
+        "config, and pyright version are all unchanged.  Opt-in, so that CI "
+        "and anyone debugging stale-cache confusion get fresh runs by default.",
+    )
+    parser.addoption(
+        "--no-pyright-skip",
+        action="store_true",
+        help="Run pyright tests even if they passed for an identical "
+        "fingerprint (pyright pin, git HEAD, and test module) last time.",
+    )
+
+
+def _warm_pyright(done: threading.Event) -> None:
+    # Check a trivial file so typeshed, node, and the hypothesis sources on
+    # extraPaths are all read (and land in the OS page cache) before the
+    # first real invocation needs them.  Results are discarded, and the
+    # scratch directory is removed once the run finishes.
+    try:
+        with tempfile.TemporaryDirectory(prefix="pyright-warmup-") as tmp:
+            workspace = Path(tmp)
+            (workspace / "warmup.py").write_text("x: int = 0\n", encoding="utf-8")
+            (workspace / "pyrightconfig.json").write_text(
+                json.dumps({"extraPaths": [str(PYTHON_SRC)]}), encoding="utf-8"
+            )
+            # close_fds=False, cwd=None, and the absolute executable path keep
+            # this on subprocess's posix_spawn() fast path; the workspace is
+            # passed via --project instead of by changing directory.
+            subprocess.run(
+                [
+                    os.path.abspath(tool_path("pyright")),
+                    "--outputjson",
+                    f"--pythonpath={sys.executable}",
+                    "--project",
+                    str(workspace),
+                ],
+                capture_output=True,
+                close_fds=False,
+            )
+    finally:
+        done.set()
+
+
+_fingerprint = None
+
+
+def _pyright_fingerprint() -> str:
+    # A re-run can only change outcome if the pyright pin, the checked-out
+    # tree, or the tests themselves changed; hash all three.
+    global _fingerprint
+    if _fingerprint is None:
+        pin = re.search(
+            r"^pyright==.+$",
+            (tools.ROOT / "requirements" / "tools.txt").read_text(encoding="utf-8"),
+            flags=re.MULTILINE,
+        ).group()
+        module = Path(__file__).with_name("test_pyright.py").read_bytes()
+        head = tools.hash_for_name("HEAD")
+        _fingerprint = hashlib.sha256(pin.encode() + head.encode() + module).hexdigest()
+    return _fingerprint
+
+
+def pytest_collection_modifyitems(config, items):
+    pyright_items = [item for item in items if item.path.name == "test_pyright.py"]
+    if not pyright_items:
+        return
+    # Re-running a test whose fingerprint matches a previous green run can't
+    # produce new signal, so skip it unless --no-pyright-skip says otherwise.
+    # Note that uncommitted edits under hypothesis-python/src are not part of
+    # the fingerprint - pass --no-pyright-skip when iterating on annotations.
+    if not config.getoption("--no-pyright-skip"):
+        # config.cache is absent under -p no:cacheprovider; skip nothing then.
+        cache = getattr(config, "cache", None)
+        green = cache.get(_PYRIGHT_GREEN_KEY, {}) if cache is not None else {}
+        if green:
+            fingerprint = _pyright_fingerprint()
+            marker = pytest.mark.skip(
+                reason="passed with identical fingerprint; --no-pyright-skip to re-run"
+            )
+            for item in pyright_items:
+                if green.get(item.nodeid) == fingerprint:
+                    item.add_marker(marker)
+    # Start warming pyright in the background, so the cold start overlaps
+    # with the remaining collection and setup (and with other workers under
+    # xdist) instead of being billed to whichever test runs first.  This
+    # comes after the fingerprint skips, and never during --collect-only:
+    # only runs where some pyright test will actually execute should spawn
+    # a warmup.  test_pyright.py waits on config._pyright_warmed before its
+    # first real invocation.
+    if (
+        not config.getoption("--collect-only")
+        and not hasattr(config, "_pyright_warmed")
+        and any(item.get_closest_marker("skip") is None for item in pyright_items)
+    ):
+        event = threading.Event()
+        config._pyright_warmed = event
+        threading.Thread(target=_warm_pyright, args=(event,), daemon=True).start()
+
+
+_pyright_passes: set[str] = set()
+
+# Must match the xdist_group mark in test_pyright.py.
+_XDIST_GROUP_SUFFIX = "@pyright-batched"
+
+
+def _normalize_nodeid(nodeid: str) -> str:
+    # Under --dist=loadgroup, xdist reports carry the group as an "@<group>"
+    # suffix which collected items never have; strip it, or recorded passes
+    # would never match a later collection (and, sharing the current
+    # fingerprint, would never be pruned either).
+    if nodeid.endswith(_XDIST_GROUP_SUFFIX):
+        nodeid = nodeid[: -len(_XDIST_GROUP_SUFFIX)]
+    return nodeid
+
+
+def pytest_runtest_logreport(report):
+    if (
+        report.when == "call"
+        and report.passed
+        and report.nodeid.split("::")[0].endswith("test_pyright.py")
+    ):
+        _pyright_passes.add(_normalize_nodeid(report.nodeid))
+
+
+def pytest_sessionfinish(session):
+    # config.cache is absent under -p no:cacheprovider; record nothing then.
+    cache = getattr(session.config, "cache", None)
+    if cache is None or not _pyright_passes:
+        return
+    fingerprint = _pyright_fingerprint()
+    # Under xdist, workers and controller each reach here and race this
+    # read-modify-write; last writer wins, which at worst forgets some
+    # passes (they just re-run next time), never skips a failure.
+    green = cache.get(_PYRIGHT_GREEN_KEY, {})
+    # Drop entries from older fingerprints so the record can't grow forever.
+    green = {k: v for k, v in green.items() if v == fingerprint}
+    green.update(dict.fromkeys(_pyright_passes, fingerprint))
+    cache.set(_PYRIGHT_GREEN_KEY, green)
@@ -10,20 +10,279 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import re
 import subprocess
 import sys
-import textwrap
 from pathlib import Path
 from typing import Any
 
+import ijson
+import orjson
 import pytest
 
+from hypothesistooling import ROOT, hash_for_name
 from hypothesistooling.projects.hypothesispython import HYPOTHESIS_PYTHON, PYTHON_SRC
 from hypothesistooling.scripts import pip_tool, tool_path
 
-PYTHON_VERSIONS = ["3.7", "3.8", "3.9", "3.10", "3.11"]
+# Released minor versions pyright can be asked about; extend when new ones ship.
+_KNOWN_PYTHON_VERSIONS = ("3.7", "3.8", "3.9", "3.10", "3.11")
+
+
+def _supported_python_versions() -> list[str]:
+    """Intersect _KNOWN_PYTHON_VERSIONS with setup.py's python_requires.
+
+    Derived rather than hard-coded, so dropping a version from setup.py also
+    stops us sweeping pyright over it here - each stale version cost one
+    extra analysis per version-parametrized check.
+    """
+    spec = re.search(
+        r'python_requires="([^"]+)"',
+        (HYPOTHESIS_PYTHON / "setup.py").read_text(encoding="utf-8"),
+    ).group(1)
+    match = re.fullmatch(r">=\s*(\d+)\.(\d+)", spec)
+    assert match is not None, f"unexpected python_requires spec {spec!r}"
+    lower = (int(match.group(1)), int(match.group(2)))
+    return [v for v in _KNOWN_PYTHON_VERSIONS if tuple(map(int, v.split("."))) >= lower]
+
+
+PYTHON_VERSIONS = _supported_python_versions()
+
+# These tests are I/O-independent, so the intended xdist invocation (local
+# and CI alike) is
+#     pytest -n auto --dist=loadgroup whole-repo-tests/test_pyright.py
+# The `xdist_group` marks only pin tests to one worker under
+# --dist=loadgroup; with the default --dist=load, every worker handed a
+# batched test would instantiate the session fixture and re-run the whole
+# pyright batch, so don't use -n without --dist=loadgroup here.  One-shot
+# tests carry no group mark and load-balance freely across workers.
+#
+# Almost all of pyright's runtime on our tiny snippets is per-invocation
+# startup (loading typeshed, resolving extraPaths, parsing stubs), so instead
+# of one subprocess per test we write every file that shares a configuration
+# into one directory and analyse each directory with a single pyright run.
+# The sources therefore live at module scope, keyed into groups below.
+
+_SOURCE_BASIC_TEST = """
+import hypothesis
+import hypothesis.strategies as st
+
+@hypothesis.given(x=st.text())
+def test_foo(x: str):
+    assert x == x
+
+from hypothesis import given
+from hypothesis.strategies import text
+
+@given(x=text())
+def test_bar(x: str):
+    assert x == x
+"""
+
+_SOURCE_GIVEN_ONLY_ALLOWS_STRATEGIES = """
+from hypothesis import given
+
+@given(1)
+def f():
+    pass
+"""
+
+_SOURCE_ISSUE_3296 = """
+from hypothesis.strategies import lists, integers
+
+lists(integers()).map(sorted)
+"""
+
+_SOURCE_MIXED_POS_KWARGS_IN_GIVEN = """
+from hypothesis import given
+from hypothesis.strategies import text
+
+@given(text(), x=text())
+def test_bar(x: str):
+    pass
+"""
+
+_SOURCE_ISSUE_3348 = """
+import hypothesis.strategies as st
+
+st.tuples(st.integers(), st.integers())
+st.one_of(st.integers(), st.integers())
+st.one_of([st.integers(), st.floats()])  # sequence of strats should be OK
+st.sampled_from([1, 2])
+"""
+
+_SOURCE_NUMPY_ARRAYS = """
+import numpy as np
+from hypothesis.extra.numpy import arrays
+
+x = arrays(dtype=np.dtype("int32"), shape=1)
+"""
+
+_SOURCE_TUPLES_POS_ARGS_ONLY = """
+import hypothesis.strategies as st
+
+st.tuples(a1=st.integers())
+st.tuples(a1=st.integers(), a2=st.integers())
+"""
+
+_SOURCE_ONE_OF_POS_ARGS_ONLY = """
+import hypothesis.strategies as st
+
+st.one_of(a1=st.integers())
+st.one_of(a1=st.integers(), a2=st.integers())
+"""
+
+_SOURCE_REGISTER_RANDOM = """
+from random import Random
+from hypothesis import register_random
+
+class MyRandom:
+    def __init__(self) -> None:
+        r = Random()
+        self.seed = r.seed
+        self.setstate = r.setstate
+        self.getstate = r.getstate
+
+register_random(MyRandom())
+register_random(None)  # type: ignore
+"""
+
+_REVEAL_CASES = [
+    ("integers()", "int"),
+    ("text()", "str"),
+    ("integers().map(str)", "str"),
+    ("booleans().filter(bool)", "bool"),
+    ("lists(none())", "List[None]"),
+    ("dictionaries(integers(), datetimes())", "Dict[int, datetime]"),
+    ("data()", "DataObject"),
+    ("none() | integers()", "int | None"),
+    ("recursive(integers(), lists)", "List[Any] | int"),
+    # We have overloads for up to five types, then fall back to Any.
+    # (why five?  JSON atoms are None|bool|int|float|str and we do that a lot)
+    ("one_of(integers(), text())", "int | str"),
+    (
+        "one_of(integers(), text(), none(), binary(), builds(list))",
+        "int | str | bytes | list[Unknown] | None",
+    ),
+    (
+        "one_of(integers(), text(), none(), binary(), builds(list), builds(dict))",
+        "Any",
+    ),
+    ("tuples()", "Tuple[()]"),
+    ("tuples(integers())", "Tuple[int]"),
+    ("tuples(integers(), text())", "Tuple[int, str]"),
+    (
+        "tuples(integers(), text(), integers(), text(), integers())",
+        "Tuple[int, str, int, str, int]",
+    ),
+    (
+        "tuples(text(), text(), text(), text(), text(), text())",
+        "Tuple[Any, ...]",
+    ),
+    (
+        'arrays(dtype=np.dtype("int32"), shape=1)',
+        "ndarray[Any, dtype[signedinteger[_32Bit]]]",
+    ),
+    # Note: keep this in sync with the equivalent test for Mypy
+]
+
+
+_REVEAL_HEADER = (
+    "import numpy as np\n"
+    "from hypothesis.extra.numpy import *\n"
+    "from hypothesis.strategies import *\n"
+)
+
+
+def _reveal_source() -> str:
+    # One reveal_type() call per line, so a single pyright pass over a single
+    # file covers every case; tests pick out their diagnostic by line number.
+    return _REVEAL_HEADER + "".join(f"reveal_type({val})\n" for val, _ in _REVEAL_CASES)
+
+
+def _reveal_line(val: str, expect: str) -> int:
+    # Zero-based, to match pyright's diagnostic ranges.
+    return _REVEAL_HEADER.count("\n") + _REVEAL_CASES.index((val, expect))
+
+
+def _batch_groups() -> dict[str, tuple[dict[str, Any], dict[str, str]]]:
+    """Map each group name to a (config, {filename: source}) pair.
+
+    Files in a group share a single pyrightconfig.json, and so can all be
+    analysed by one pyright invocation over their directory.  The python
+    version sweep rides along in the strict group: each version gets a
+    subdirectory declared as an executionEnvironment with that
+    pythonVersion, so one pass covers the whole cross-product.
+    """
+    strict_files = {
+        "issue_3296.py": _SOURCE_ISSUE_3296,
+        "mixed_pos_kwargs_in_given.py": _SOURCE_MIXED_POS_KWARGS_IN_GIVEN,
+        "issue_3348.py": _SOURCE_ISSUE_3348,
+        "numpy_arrays.py": _SOURCE_NUMPY_ARRAYS,
+        "tuples_pos_args_only.py": _SOURCE_TUPLES_POS_ARGS_ONLY,
+        "one_of_pos_args_only.py": _SOURCE_ONE_OF_POS_ARGS_ONLY,
+    }
+    for version in PYTHON_VERSIONS:
+        strict_files[f"py{version}/basic_test.py"] = _SOURCE_BASIC_TEST
+        strict_files[f"py{version}/given_only.py"] = (
+            _SOURCE_GIVEN_ONLY_ALLOWS_STRATEGIES
+        )
+    strict_config = {
+        "typeCheckingMode": "strict",
+        "executionEnvironments": [
+            {"root": f"py{version}", "pythonVersion": version}
+            for version in PYTHON_VERSIONS
+        ],
+    }
+    return {
+        "strict": (strict_config, strict_files),
+        "reveal": (
+            {"reportWildcardImportFromLibrary ": "none"},
+            {"reveal.py": _reveal_source()},
+        ),
+    }
+
+
+@pytest.fixture(scope="session")
+def pyright_batched(
+    tmp_path_factory, pytestconfig
+) -> dict[str, dict[str, list[dict[str, Any]]]]:
+    """Diagnostics for every batched test file, keyed by group then filename.
+
+    Tests whose configuration has no batch-mates (e.g. those setting
+    reportUnnecessaryTypeIgnoreComment) still shell out per-file via
+    `_pyright_diagnostics`.
+    """
+    results = {}
+    for group, (config, files) in _batch_groups().items():
+        workspace = tmp_path_factory.mktemp(group)
+        for filename, source in files.items():
+            path = workspace / filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_source(path, source)
+        _write_config(workspace, config, include=sorted(files))
+        by_file: dict[str, list[dict[str, Any]]] = {filename: [] for filename in files}
+        for diag in _pyright_diagnostics(
+            workspace, files, config, pytestconfig, stream=True
+        ):
+            by_file.setdefault(diag["file"], []).append(diag)
+        results[group] = by_file
+    return results
+
+
+@pytest.fixture(scope="session")
+def pyright_workspace(tmp_path_factory) -> Path:
+    """One reusable directory for the one-shot (non-batched) pyright checks.
+
+    Tests only use tmp_path for scratch space, not isolation, so sharing a
+    single workspace avoids per-test directory churn and lets pyright's own
+    workspace metadata caches carry over between tests.  Each test replaces
+    `test.py` and, only when its content actually changes,
+    `pyrightconfig.json`.
+    """
+    return tmp_path_factory.mktemp("pyright_ws")
 
 
 @pytest.mark.skip(
@@ -34,306 +293,334 @@ def test_pyright_passes_on_hypothesis():
     pip_tool("pyright", "--project", HYPOTHESIS_PYTHON)
 
 
+@pytest.mark.xdist_group("pyright-batched")
 @pytest.mark.parametrize("python_version", PYTHON_VERSIONS)
-def test_pyright_passes_on_basic_test(tmp_path: Path, python_version: str):
-    file = tmp_path / "test.py"
-    file.write_text(
-        textwrap.dedent(
-            """
-            import hypothesis
-            import hypothesis.strategies as st
-
-            @hypothesis.given(x=st.text())
-            def test_foo(x: str):
-                assert x == x
-
-            from hypothesis import given
-            from hypothesis.strategies import text
-
-            @given(x=text())
-            def test_bar(x: str):
-                assert x == x
-            """
-        ),
-        encoding="utf-8",
-    )
-    _write_config(
-        tmp_path, {"typeCheckingMode": "strict", "pythonVersion": python_version}
-    )
-    assert _get_pyright_errors(file) == []
+def test_pyright_passes_on_basic_test(pyright_batched, python_version: str):
+    assert pyright_batched["strict"][f"py{python_version}/basic_test.py"] == []
 
 
+@pytest.mark.xdist_group("pyright-batched")
 @pytest.mark.parametrize("python_version", PYTHON_VERSIONS)
-def test_given_only_allows_strategies(tmp_path: Path, python_version: str):
-    file = tmp_path / "test.py"
-    file.write_text(
-        textwrap.dedent(
-            """
-            from hypothesis import given
-
-            @given(1)
-            def f():
-                pass
-            """
-        ),
-        encoding="utf-8",
-    )
-    _write_config(
-        tmp_path, {"typeCheckingMode": "strict", "pythonVersion": python_version}
-    )
+def test_given_only_allows_strategies(pyright_batched, python_version: str):
+    errors = pyright_batched["strict"][f"py{python_version}/given_only.py"]
     assert (
         sum(
             e["message"].startswith(
                 'Argument of type "Literal[1]" cannot be assigned to parameter "_given_arguments"'
             )
-            for e in _get_pyright_errors(file)
+            for e in errors
         )
         == 1
     )
 
 
-def test_pyright_issue_3296(tmp_path: Path):
-    file = tmp_path / "test.py"
-    file.write_text(
-        textwrap.dedent(
-            """
-            from hypothesis.strategies import lists, integers
+@pytest.mark.xdist_group("pyright-batched")
+def test_pyright_issue_3296(pyright_batched):
+    assert pyright_batched["strict"]["issue_3296.py"] == []
 
-            lists(integers()).map(sorted)
-            """
-        ),
-        encoding="utf-8",
-    )
-    _write_config(tmp_path, {"typeCheckingMode": "strict"})
-    assert _get_pyright_errors(file) == []
-
-
-def test_pyright_raises_for_mixed_pos_kwargs_in_given(tmp_path: Path):
-    file = tmp_path / "test.py"
-    file.write_text(
-        textwrap.dedent(
-            """
-            from hypothesis import given
-            from hypothesis.strategies import text
-
-            @given(text(), x=text())
-            def test_bar(x: str):
-                pass
-            """
-        ),
-        encoding="utf-8",
-    )
-    _write_config(tmp_path, {"typeCheckingMode": "strict"})
+
+@pytest.mark.xdist_group("pyright-batched")
+def test_pyright_raises_for_mixed_pos_kwargs_in_given(pyright_batched):
+    errors = pyright_batched["strict"]["mixed_pos_kwargs_in_given.py"]
     assert (
         sum(
             e["message"].startswith(
                 'No overloads for "given" match the provided arguments'
             )
-            for e in _get_pyright_errors(file)
+            for e in errors
         )
         == 1
     )
 
 
-def test_pyright_issue_3348(tmp_path: Path):
-    file = tmp_path / "test.py"
-    file.write_text(
-        textwrap.dedent(
-            """
-            import hypothesis.strategies as st
-
-            st.tuples(st.integers(), st.integers())
-            st.one_of(st.integers(), st.integers())
-            st.one_of([st.integers(), st.floats()])  # sequence of strats should be OK
-            st.sampled_from([1, 2])
-            """
-        ),
-        encoding="utf-8",
-    )
-    _write_config(tmp_path, {"typeCheckingMode": "strict"})
-    assert _get_pyright_errors(file) == []
-
+@pytest.mark.xdist_group("pyright-batched")
+def test_pyright_issue_3348(pyright_batched):
+    assert pyright_batched["strict"]["issue_3348.py"] == []
 
-def test_numpy_arrays_strategy(tmp_path: Path):
-    file = tmp_path / "test.py"
-    file.write_text(
-        textwrap.dedent(
-            """
-            import numpy as np
-            from hypothesis.extra.numpy import arrays
 
-            x = arrays(dtype=np.dtype("int32"), shape=1)
-            """
-        ),
-        encoding="utf-8",
-    )
-    _write_config(tmp_path, {"typeCheckingMode": "strict"})
-    errors = _get_pyright_errors(file)
+@pytest.mark.xdist_group("pyright-batched")
+def test_numpy_arrays_strategy(pyright_batched):
+    errors = pyright_batched["strict"]["numpy_arrays.py"]
     print(errors)
     assert errors == []
 
 
-@pytest.mark.parametrize(
-    "val,expect",
-    [
-        ("integers()", "int"),
-        ("text()", "str"),
-        ("integers().map(str)", "str"),
-        ("booleans().filter(bool)", "bool"),
-        ("lists(none())", "List[None]"),
-        ("dictionaries(integers(), datetimes())", "Dict[int, datetime]"),
-        ("data()", "DataObject"),
-        ("none() | integers()", "int | None"),
-        ("recursive(integers(), lists)", "List[Any] | int"),
-        # We have overloads for up to five types, then fall back to Any.
-        # (why five?  JSON atoms are None|bool|int|float|str and we do that a lot)
-        ("one_of(integers(), text())", "int | str"),
-        (
-            "one_of(integers(), text(), none(), binary(), builds(list))",
-            "int | str | bytes | list[Unknown] | None",
-        ),
-        (
-            "one_of(integers(), text(), none(), binary(), builds(list), builds(dict))",
-            "Any",
-        ),
-        ("tuples()", "Tuple[()]"),
-        ("tuples(integers())", "Tuple[int]"),
-        ("tuples(integers(), text())", "Tuple[int, str]"),
-        (
-            "tuples(integers(), text(), integers(), text(), integers())",
-            "Tuple[int, str, int, str, int]",
-        ),
-        (
-            "tuples(text(), text(), text(), text(), text(), text())",
-            "Tuple[Any, ...]",
-        ),
-        (
-            'arrays(dtype=np.dtype("int32"), shape=1)',
-            "ndarray[Any, dtype[signedinteger[_32Bit]]]",
-        ),
-        # Note: keep this in sync with the equivalent test for Mypy
-    ],
-)
-def test_revealed_types(tmp_path, val, expect):
+@pytest.mark.xdist_group("pyright-batched")
+@pytest.mark.parametrize("val,expect", _REVEAL_CASES)
+def test_revealed_types(pyright_batched, val, expect):
     """Check that Pyright picks up the expected `X` in SearchStrategy[`X`]."""
-    f = tmp_path / (expect + ".py")
-    f.write_text(
-        "import numpy as np\n"
-        "from hypothesis.extra.numpy import *\n"
-        "from hypothesis.strategies import *\n"
-        f"reveal_type({val})\n",  # fmt: skip
-        encoding="utf-8",
-    )
-    _write_config(tmp_path, {"reportWildcardImportFromLibrary ": "none"})
-    typ = get_pyright_analysed_type(f)
+    line = _reveal_line(val, expect)
+    diagnostics = [
+        d
+        for d in pyright_batched["reveal"]["reveal.py"]
+        if d["range"]["start"]["line"] == line
+    ]
+    typ = get_pyright_analysed_type(diagnostics)
     assert typ == f"SearchStrategy[{expect}]"
 
 
-def test_pyright_tuples_pos_args_only(tmp_path: Path):
-    file = tmp_path / "test.py"
-    file.write_text(
-        textwrap.dedent(
-            """
-            import hypothesis.strategies as st
-
-            st.tuples(a1=st.integers())
-            st.tuples(a1=st.integers(), a2=st.integers())
-            """
-        ),
-        encoding="utf-8",
-    )
-    _write_config(tmp_path, {"typeCheckingMode": "strict"})
+@pytest.mark.xdist_group("pyright-batched")
+def test_pyright_tuples_pos_args_only(pyright_batched):
+    errors = pyright_batched["strict"]["tuples_pos_args_only.py"]
     assert (
         sum(
             e["message"].startswith(
                 'No overloads for "tuples" match the provided arguments'
             )
-            for e in _get_pyright_errors(file)
+            for e in errors
         )
         == 2
     )
 
 
-def test_pyright_one_of_pos_args_only(tmp_path: Path):
-    file = tmp_path / "test.py"
-    file.write_text(
-        textwrap.dedent(
-            """
-            import hypothesis.strategies as st
-
-            st.one_of(a1=st.integers())
-            st.one_of(a1=st.integers(), a2=st.integers())
-            """
-        ),
-        encoding="utf-8",
-    )
-    _write_config(tmp_path, {"typeCheckingMode": "strict"})
+@pytest.mark.xdist_group("pyright-batched")
+def test_pyright_one_of_pos_args_only(pyright_batched):
+    errors = pyright_batched["strict"]["one_of_pos_args_only.py"]
     assert (
         sum(
             e["message"].startswith(
                 'No overloads for "one_of" match the provided arguments'
             )
-            for e in _get_pyright_errors(file)
+            for e in errors
         )
         == 2
     )
 
 
-def test_register_random_protocol(tmp_path: Path):
-    file = tmp_path / "test.py"
-    file.write_text(
-        textwrap.dedent(
-            """
-            from random import Random
-            from hypothesis import register_random
-
-            class MyRandom:
-                def __init__(self) -> None:
-                    r = Random()
-                    self.seed = r.seed
-                    self.setstate = r.setstate
-                    self.getstate = r.getstate
-
-            register_random(MyRandom())
-            register_random(None)  # type: ignore
-            """
-        ),
-        encoding="utf-8",
-    )
-    _write_config(tmp_path, {"reportUnnecessaryTypeIgnoreComment": True})
-    assert _get_pyright_errors(file) == []
+def test_register_random_protocol(pyright_workspace: Path, pytestconfig):
+    # This config enables reportUnnecessaryTypeIgnoreComment, so it can't
+    # join the batched groups above and keeps a one-shot pyright invocation.
+    files = {"test.py": _SOURCE_REGISTER_RANDOM}
+    config = {"reportUnnecessaryTypeIgnoreComment": True}
+    _write_source(pyright_workspace / "test.py", _SOURCE_REGISTER_RANDOM)
+    _write_config(pyright_workspace, config, include=["test.py"])
+    assert _pyright_diagnostics(pyright_workspace, files, config, pytestconfig) == []
 
 
 # ---------- Helpers for running pyright ---------- #
 
-
-def _get_pyright_output(file: Path) -> dict[str, Any]:
+# An absolute executable path is one of the conditions for subprocess's
+# posix_spawn() fast path (see Lib/subprocess.py `_execute_child`); the
+# others we must uphold at each call site are close_fds=False, cwd=None,
+# and no preexec_fn/pass_fds/env mutation.  Falling back to fork()+exec()
+# would copy the page tables of this process, which has imported
+# hypothesis, numpy, and pytest.  We therefore point pyright at its
+# workspace with --project rather than by changing directory.
+_PYRIGHT = os.path.abspath(tool_path("pyright"))
+
+
+def _pyright_argv(workspace: Path) -> list[str]:
+    return [
+        _PYRIGHT,
+        "--outputjson",
+        f"--pythonpath={sys.executable}",
+        "--project",
+        str(workspace),
+    ]
+
+
+def _get_pyright_output(workspace: Path) -> dict[str, Any]:
+    # Capturing bytes (no text=True) lets orjson parse the output directly,
+    # without decoding to str first - the JSON for a whole batched directory
+    # can run to hundreds of KB.
     proc = subprocess.run(
-        [tool_path("pyright"), "--outputjson", f"--pythonpath={sys.executable}"],
-        cwd=file.parent,
-        encoding="utf-8",
-        text=True,
+        _pyright_argv(workspace),
         capture_output=True,
+        close_fds=False,
     )
     try:
-        return json.loads(proc.stdout)
+        return orjson.loads(proc.stdout)
     except Exception:
-        print(proc.stdout)
+        print(proc.stdout.decode(errors="replace"))
         raise
 
 
-def _get_pyright_errors(file: Path) -> list[dict[str, Any]]:
-    return _get_pyright_output(file)["generalDiagnostics"]
+def _stream_pyright_diagnostics(workspace: Path) -> list[dict[str, Any]]:
+    """Run pyright one-shot, consuming diagnostics as they are emitted.
 
-
-def get_pyright_analysed_type(fname):
-    out, *rest = _get_pyright_errors(fname)
+    For a batched directory the --outputjson document is large; parsing it
+    incrementally with ijson overlaps our parse with pyright's own output
+    generation instead of buffering the whole document first.
+    """
+    proc = subprocess.Popen(
+        _pyright_argv(workspace),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        close_fds=False,
+    )
+    try:
+        return list(ijson.items(proc.stdout, "generalDiagnostics.item"))
+    except ijson.JSONError:
+        # Malformed output (e.g. a crash report): print whatever remains so
+        # there is something to debug from, then re-raise.
+        print(proc.stdout.read().decode(errors="replace"))
+        raise
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+
+# Parsed from the pin rather than `pyright --version` to avoid paying an
+# extra node startup just to key the cache; the test env is built from it.
+_PYRIGHT_VERSION = re.search(
+    r"^pyright==(.+)$",
+    (ROOT / "requirements" / "tools.txt").read_text(encoding="utf-8"),
+    flags=re.MULTILINE,
+).group(1)
+
+
+_head_sha = None
+
+
+def _hypothesis_head() -> str:
+    global _head_sha
+    if _head_sha is None:
+        _head_sha = hash_for_name("HEAD")
+    return _head_sha
+
+
+def _cache_key(files: dict[str, str], config: dict[str, Any]) -> str:
+    # The hypothesis sources on extraPaths are as much an input to the
+    # diagnostics as the snippets themselves, so key on the committed tree
+    # via HEAD (as the conftest fingerprint does).  Uncommitted edits are
+    # still invisible here - hence --pyright-cached stays opt-in.
+    payload = json.dumps(
+        {
+            "files": files,
+            "config": config,
+            "base_config": _BASE_CONFIG,
+            "pyright": _PYRIGHT_VERSION,
+            "python": sys.version,
+            "hypothesis": _hypothesis_head(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode()).hexdigest()
+
+
+# A persistent `pyright --watch --outputjson` daemon (which works: it stays
+# alive and emits a well-formed JSON document per re-analysis) was tried here
+# to amortize pyright's cold start across checks.  It was dropped because
+# batching leaves each workspace analyzed exactly once per session, so a warm
+# process has nothing to amortize and the extra lifecycle management didn't
+# pay for itself.  Worth revisiting if per-workspace re-checks ever return.
+
+
+def _pyright_diagnostics(
+    workspace: Path,
+    files: dict[str, str],
+    config: dict[str, Any],
+    pytestconfig,
+    *,
+    stream: bool = False,
+) -> list[dict[str, Any]]:
+    """Return generalDiagnostics for a workspace which already contains `files`.
+
+    Diagnostic `file` entries are rewritten to workspace-relative paths, both
+    so callers can key on stable names and so cached results remain valid
+    when a later run gets a different tmp directory for the same sources.
+
+    With `--pyright-cached`, results are memoised across pytest runs under a
+    content hash of the sources, config, and pyright version, so unchanged
+    snippets skip the pyright invocation entirely on local re-runs.
+    """
+    # config.cache is absent under -p no:cacheprovider, which simply
+    # disables --pyright-cached.
+    cache = (
+        getattr(pytestconfig, "cache", None)
+        if pytestconfig.getoption("--pyright-cached")
+        else None
+    )
+    if cache is not None:
+        key = "hypothesis/pyright/" + _cache_key(files, config)
+        hit = cache.get(key, None)
+        if hit is not None:
+            return hit
+    # Let the session-start warmup (see conftest.py) finish first, so we
+    # don't race a second cold pyright against it for the same resources.
+    warmed = getattr(pytestconfig, "_pyright_warmed", None)
+    if warmed is not None:
+        warmed.wait(timeout=300)
+    if stream:
+        diagnostics = _stream_pyright_diagnostics(workspace)
+    else:
+        diagnostics = _get_pyright_output(workspace)["generalDiagnostics"]
+    root = workspace.resolve()
+    for diag in diagnostics:
+        file = diag.get("file")
+        if file is not None:
+            try:
+                diag["file"] = Path(file).resolve().relative_to(root).as_posix()
+            except ValueError:
+                pass  # e.g. a diagnostic about something on extraPaths
+    if cache is not None:
+        cache.set(key, diagnostics)
+    return diagnostics
+
+
+_REVEAL_RE = re.compile(r'Type of ".+" is "(.+)"')
+
+
+def get_pyright_analysed_type(diagnostics: list[dict[str, Any]]):
+    out, *rest = diagnostics
     print(out, rest)
     assert not rest
     assert out["severity"] == "information"
-    return re.fullmatch(r'Type of ".+" is "(.+)"', out["message"]).group(1)
-
-
-def _write_config(config_dir: Path, data: dict[str, Any] | None = None):
-    config = {"extraPaths": [str(PYTHON_SRC)], **(data or {})}
-    (config_dir / "pyrightconfig.json").write_text(json.dumps(config), encoding="utf-8")
+    return _REVEAL_RE.fullmatch(out["message"]).group(1)
+
+
+# The base settings never vary, so serialize the common case once at import
+# time rather than re-stringifying the Path and re-dumping per test.  Beyond
+# extraPaths, they keep each invocation's analysis scoped to the snippets
+# under test: don't chase sources for stub-only modules, skip the bodies of
+# wholly-unannotated functions, and take library types as shipped.  None of
+# these affect the diagnostics our assertions look at.
+_BASE_CONFIG: dict[str, Any] = {
+    "extraPaths": [str(PYTHON_SRC)],
+    "reportMissingModuleSource": "none",
+    "analyzeUnannotatedFunctions": False,
+    "useLibraryCodeForTypes": True,
+}
+_BASE_CONFIG_BYTES = json.dumps(_BASE_CONFIG).encode()
+
+
+# Last-written content per path, so re-checks of a shared workspace skip the
+# write when nothing changed.  Short of driving pyright-langserver over
+# JSON-RPC with in-memory documents, this is as close as we get to keeping
+# unchanged sources off the filesystem.
+_written_sources: dict[Path, str] = {}
+
+
+def _write_source(path: Path, source: str) -> bool:
+    """Write `source` to `path`, returning whether anything was written."""
+    if _written_sources.get(path) == source:
+        return False
+    path.write_text(source, encoding="utf-8")
+    _written_sources[path] = source
+    return True
+
+
+# Last-written config per directory, so re-checks of a shared workspace can
+# skip the rewrite (and the resulting pyright config reload) when unchanged.
+_written_configs: dict[Path, bytes] = {}
+
+
+def _write_config(
+    config_dir: Path,
+    data: dict[str, Any] | None = None,
+    *,
+    include: list[str] | None = None,
+):
+    if data or include:
+        config = {**_BASE_CONFIG, **(data or {})}
+        if include is not None:
+            # Restrict analysis to the files we wrote, so pyright doesn't
+            # spider whatever else has accumulated in a shared workspace.
+            config["include"] = include
+        payload = json.dumps(config).encode()
+    else:
+        payload = _BASE_CONFIG_BYTES
+    if _written_configs.get(config_dir) == payload:
+        return
+    (config_dir / "pyrightconfig.json").write_bytes(payload)
+    _written_configs[config_dir] = payload